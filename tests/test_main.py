@@ -0,0 +1,33 @@
+import os
+import time
+
+import pytest
+
+from xautic.main import StatReloader
+
+
+def test_step_through_detects_same_size_edit(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("spam = 1")
+    reloader = StatReloader(track=[str(script)], quiet_period=0.0)
+    with reloader:
+        pass
+    time.sleep(0.01)
+    script.write_text("eggs = 2")
+    reloader.step_through()
+    assert reloader._pending_reload is not None
+
+
+def test_step_through_detects_change(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("pass")
+    reloader = StatReloader(track=[str(script)], quiet_period=0.0)
+    with reloader:
+        pass
+    later = time.time() + 10
+    os.utime(script, (later, later))
+    reloader.step_through()
+    assert reloader._pending_reload is not None
+    with pytest.raises(SystemExit) as exc:
+        reloader._flush_pending_reload()
+    assert exc.value.code == 3
@@ -1,7 +1,10 @@
 import sys
 
 from xautic.main import _all_possible_paths
-from xautic.main import _get_args_for_reloading
+from xautic.utils import _classify_patterns
+from xautic.utils import _get_args_nt
+from xautic.utils import _get_args_posix
+from xautic.utils import clear_path_cache
 
 
 def test_ignore_patterns():
@@ -11,11 +14,57 @@ def test_ignore_patterns():
     assert not any(p.startswith(sys.prefix) for p in paths)
 
 
+def test_classify_patterns():
+    literals, suffixes, globs = _classify_patterns(
+        frozenset({"build", "*.pyc", "dist/*"})
+    )
+    assert literals == frozenset({"build"})
+    assert suffixes == (".pyc",)
+    assert globs == ("dist/*",)
+
+
+def test_dir_cache_invalidation(tmp_path):
+    clear_path_cache()
+    (tmp_path / "a.py").write_text("")
+    paths = _all_possible_paths({str(tmp_path)}, set())
+    assert str(tmp_path / "a.py") in paths
+    (tmp_path / "b.py").write_text("")
+    paths = _all_possible_paths({str(tmp_path)}, set())
+    assert str(tmp_path / "b.py") in paths
+
+
+def test_tracked_file_under_seed_is_kept(tmp_path):
+    clear_path_cache()
+    config = tmp_path / "__pycache__" / "config.yaml"
+    config.parent.mkdir()
+    config.write_text("")
+    paths = _all_possible_paths({str(tmp_path), str(config)}, set())
+    assert str(config) in paths
+
+
+def test_symlinked_file_is_tracked(tmp_path):
+    clear_path_cache()
+    (tmp_path / "real.py").write_text("")
+    (tmp_path / "linked.py").symlink_to(tmp_path / "real.py")
+    paths = _all_possible_paths({str(tmp_path)}, set())
+    assert str(tmp_path / "linked.py") in paths
+
+
 def test_get_args_for_reloading(monkeypatch, tmp_path):
     argv = [str(tmp_path / "test.exe"), "run"]
     monkeypatch.setattr("sys.executable", str(tmp_path / "python.exe"))
     monkeypatch.setattr("sys.argv", argv)
     monkeypatch.setattr("__main__.__package__", None)
-    monkeypatch.setattr("os.name", "nt")
-    args = _get_args_for_reloading()
+    args = _get_args_nt()
     assert args == argv
+
+
+def test_get_args_variants_agree(monkeypatch, tmp_path):
+    script = tmp_path / "test.py"
+    script.write_text("")
+    argv = [str(script), "run"]
+    monkeypatch.setattr("sys.executable", "/usr/bin/python3")
+    monkeypatch.setattr("sys.argv", argv)
+    monkeypatch.setattr("__main__.__package__", None)
+    assert _get_args_posix() == _get_args_nt()
+    assert _get_args_posix() == ["/usr/bin/python3", str(script), "run"]
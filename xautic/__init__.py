@@ -1,5 +1,6 @@
 """xautic: live reloading with Python."""
 
+from .main import InotifyReloader
 from .main import StatReloader
 from .main import debug
 from .main import restart_with_reloader
@@ -12,6 +13,7 @@ except ImportError:
 
 __all__ = [
     "__version__",
+    "InotifyReloader",
     "StatReloader",
     "debug",
     "restart_with_reloader",